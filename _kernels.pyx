@@ -0,0 +1,60 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional C-compiled benchmark kernels for github_actions_core_power_analyzer.
+
+Build in place with:  python3 setup.py build_ext --inplace
+"""
+
+cdef extern from *:
+    """
+    /* Unsigned, so sums past 2**64 wrap (defined) instead of overflowing.
+       The empty asm ties total to a register each iteration, which stops
+       the compiler from replacing the loop with n*(n-1)/2. */
+    static unsigned long long arith_sum_loop(unsigned long long n) {
+        unsigned long long total = 0;
+        unsigned long long i;
+        for (i = 0; i < n; i++) {
+            total += i;
+    #if defined(__GNUC__) || defined(__clang__)
+            __asm__ volatile("" : "+r"(total));
+    #endif
+        }
+        return total;
+    }
+    """
+    unsigned long long arith_sum_loop(unsigned long long n) nogil
+
+cpdef unsigned long long arith_sum(unsigned long long n):
+    """Sum 0..n-1 modulo 2**64 with a typed C loop"""
+    return arith_sum_loop(n)
+
+cpdef long long fib(int n):
+    """Naive recursive fibonacci on machine ints"""
+    if n <= 1:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+cpdef bint is_prime(long long n):
+    """Trial division by 6k±1 candidates up to sqrt(n)"""
+    cdef long long i
+    if n < 2:
+        return False
+    if n < 4:
+        return True
+    if n % 2 == 0 or n % 3 == 0:
+        return False
+    i = 5
+    while i * i <= n:
+        if n % i == 0 or n % (i + 2) == 0:
+            return False
+        i += 6
+    return True
+
+cpdef long long count_primes(long long limit):
+    """Count primes below limit without returning to Python per candidate"""
+    cdef long long n
+    cdef long long count = 0
+    for n in range(2, limit):
+        if is_prime(n):
+            count += 1
+    return count
@@ -14,274 +14,811 @@ Works on Ubuntu 24.04 LTS and ARM runners
 
 import os
 import sys
+import argparse
 import subprocess
 import time
 import json
 import math
+import re
+import shutil
+import functools
+import io
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional Cython kernels, see setup.py
+try:
+    import _kernels
+except ImportError:
+    _kernels = None
+
+# Elements per NumPy block in the arithmetic benchmark (~80MB of int64)
+ARITHMETIC_CHUNK = 10_000_000
+
+# Fixed benchmark sizes used by a default run
+DEFAULT_WORKLOAD = {"iterations": 100_000_000, "n": 35, "limit": 100_000, "size": 5_000_000}
+# Calibration probe starting sizes, and the smallest a calibrated run uses
+MIN_WORKLOAD = {"iterations": 1_000_000, "n": 20, "limit": 1_000, "size": 10_000}
+# Largest sizes a calibrated run may grow to (bounds sieve/sort memory)
+MAX_WORKLOAD = {"iterations": 10_000_000_000, "n": 45, "limit": 100_000_000, "size": 20_000_000}
+# Wall time each benchmark aims for in a calibrated run (x10 with --long)
+CALIBRATION_TARGET_S = 0.2
+# Probes grow until they take at least this fraction of the target time
+CALIBRATION_PROBE_FRACTION = 1 / 20
+# Each +1 on n multiplies recursive fib work by ~PHI
+PHI = (1 + 5 ** 0.5) / 2
+# One fib_iter(n) call takes microseconds; repeat it to get a measurable time
+FIB_ITER_REPEATS = 100_000
+
+# Rating labels shared by every rated metric, best first; each metric
+# supplies its own four upper bounds
+RATING_TIERS = [
+    ("🟢 EXCELLENT", "Well-provisioned, no throttling"),
+    ("🟢 GOOD", "Normal performance"),
+    ("🟡 ACCEPTABLE", "Some system load or throttling"),
+    ("🟠 DEGRADED", "Possible thermal throttling"),
+    ("🔴 POOR", "Significant throttling or overload"),
+]
+# Arithmetic: ms per 100M ops, per implementation, since the tiers differ
+# by orders of magnitude on the same host. The NumPy bounds are the
+# original ones, which only a vectorized sum can reach. The pure-Python
+# bounds keep the same proportions, scaled so that a 2.1GHz Xeon KVM vCPU
+# on CPython 3.11.7 (loop ~5.6s, sum(range) ~2.35s per 100M) sits mid
+# ACCEPTABLE. Implementations without an entry are reported but not rated.
+ARITHMETIC_THRESHOLDS = {
+    "numpy": (80, 150, 250, 400),
+    "builtin_sum": (950, 1750, 2950, 4700),
+    "python_loop": (2250, 4200, 7000, 11200),
+}
+# Iterative fib: ns per loop step (one tuple swap and add). Measured at
+# ~35-50 ns on a 2.1GHz Xeon KVM vCPU with CPython 3.11.7, which these
+# bounds place in GOOD/ACCEPTABLE, matching its arithmetic rating.
+FIB_ITER_THRESHOLDS = (20, 35, 55, 80)
+
+# "cpu MHz : 2400.000" lines in raw /proc/cpuinfo bytes
+_MHZ_RE = re.compile(rb"^cpu MHz\s*:\s*([\d.]+)", re.M)
+# First "model name : ..." line in raw /proc/cpuinfo bytes (absent on most ARM)
+_MODEL_RE = re.compile(rb"^model name\s*:\s*(.+)$", re.M)
+# "Key:   value" lines in lscpu output (newer lscpu indents nested keys)
+_LSCPU_RE = re.compile(r"^[ \t]*([^:\n]+?):[ \t]*(.*?)[ \t]*$", re.M)
+
+if njit is not None:
+    @njit(cache=True)
+    def _fib_nb(n):
+        if n <= 1:
+            return n
+        return _fib_nb(n-1) + _fib_nb(n-2)
+else:
+    _fib_nb = None
+
+@functools.lru_cache(maxsize=None)
+def fib_memo(n):
+    if n <= 1:
+        return n
+    return fib_memo(n-1) + fib_memo(n-2)
+
+def fib_iter(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+def _rate(value, thresholds):
+    """Map a lower-is-better value onto RATING_TIERS"""
+    for (rating, reason), bound in zip(RATING_TIERS, thresholds):
+        if value < bound:
+            return rating, reason
+    return RATING_TIERS[-1]
+
+def _read_cpuinfo_bytes():
+    """Raw /proc/cpuinfo, or b"" where it doesn't exist"""
+    try:
+        with open("/proc/cpuinfo", "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return b""
+
+def _read_meminfo_bytes():
+    """Raw /proc/meminfo, or b"" where it doesn't exist"""
+    try:
+        with open("/proc/meminfo", "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return b""
+
+def _mem_kb(data, key):
+    """Read the kB value for `key` from raw /proc/meminfo bytes"""
+    i = data.find(key)
+    if i < 0:
+        return None
+    j = data.find(b"\n", i)
+    if j < 0:
+        j = len(data)
+    return int(data[i + len(key):j].split()[0])
+
+def _count_cpu_list(cpu_list):
+    """Count CPUs in a sysfs cpu list (e.g. 0-3,8,10-11)"""
+    count = 0
+    for part in cpu_list.strip().split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            count += int(hi) - int(lo) + 1
+        elif part:
+            count += 1
+    return count
+
+# Benchmark kernels are top-level functions returning metric dicts so they
+# pickle cleanly into ProcessPoolExecutor workers; printing stays in the
+# analyzer's report_* methods.
+
+def run_arithmetic_benchmark(iterations, legacy=False):
+    """Sum the first `iterations` integers"""
+    if legacy:
+        impl = "python_loop"
+    elif np is not None:
+        impl = "numpy"
+    elif _kernels is not None:
+        impl = "cython"
+    else:
+        impl = "builtin_sum"
+
+    start = time.perf_counter_ns()
+    total = 0
+    if impl == "numpy":
+        # Chunked reduction keeps peak memory bounded
+        for base in range(0, iterations, ARITHMETIC_CHUNK):
+            stop = min(base + ARITHMETIC_CHUNK, iterations)
+            total += int(np.arange(base, stop, dtype=np.int64).sum())
+    elif impl == "cython":
+        total = _kernels.arith_sum(iterations)
+    elif impl == "builtin_sum":
+        # C-level iteration, no per-item bytecode dispatch
+        total = sum(range(iterations))
+    else:
+        for i in range(iterations):
+            total += i
+    duration_ns = time.perf_counter_ns() - start
+
+    duration_ms = duration_ns / 1e6
+    gops = iterations / duration_ns  # ops per ns == billions of ops per sec
+
+    return {
+        "arithmetic_iterations": iterations,
+        "arithmetic_benchmark_ms": duration_ms,
+        "arithmetic_gops": gops,
+        "arithmetic_impl": impl,
+        # Sum modulo 2**64, identical for every implementation; reporting
+        # it keeps the work observable so it can't be optimized away
+        "arithmetic_checksum": total & 0xFFFFFFFFFFFFFFFF,
+    }
+
+def run_fibonacci_benchmark(n, honest=False, legacy=False):
+    """Compute fib(n) recursively (and iteratively when `honest`)"""
+    def fib(n):
+        if n <= 1:
+            return n
+        return fib(n-1) + fib(n-2)
+
+    if legacy:
+        fib_impl, impl = fib, "python"
+    elif _fib_nb is not None:
+        # Warm up so JIT compilation stays out of the timed region
+        _fib_nb(5)
+        fib_impl, impl = _fib_nb, "numba"
+    elif _kernels is not None:
+        fib_impl, impl = _kernels.fib, "cython"
+    else:
+        fib_impl, impl = fib, "python"
+
+    start = time.perf_counter_ns()
+    result = fib_impl(n)
+    duration_ns = time.perf_counter_ns() - start
+
+    # Memoized variant: O(n) calls instead of O(2^n)
+    fib_memo.cache_clear()
+    start = time.perf_counter_ns()
+    fib_memo(n)
+    memo_duration_ns = time.perf_counter_ns() - start
+
+    metrics = {
+        "fibonacci_n": n,
+        "fibonacci_result": int(result),
+        "fibonacci_ms": duration_ns / 1e6,
+        "fibonacci_memo_ms": memo_duration_ns / 1e6,
+        "fibonacci_impl": impl,
+    }
+
+    if honest:
+        # Plain integer arithmetic, free of function-call overhead
+        start = time.perf_counter_ns()
+        for _ in range(FIB_ITER_REPEATS):
+            fib_iter(n)
+        iter_duration_ns = time.perf_counter_ns() - start
+        metrics["fibonacci_iter_ms"] = iter_duration_ns / 1e6
+        metrics["fibonacci_iter_repeats"] = FIB_ITER_REPEATS
+        metrics["fibonacci_iter_ns_per_step"] = iter_duration_ns / (FIB_ITER_REPEATS * max(n, 1))
+
+    return metrics
+
+def run_prime_benchmark(limit, legacy=False):
+    """Count primes below `limit`"""
+    def is_prime(n):
+        if n < 2:
+            return False
+        if n < 4:
+            return True
+        if n % 2 == 0 or n % 3 == 0:
+            return False
+        # 6k±1 wheel: every prime > 3 is adjacent to a multiple of 6
+        r = math.isqrt(n)
+        i = 5
+        while i <= r:
+            if n % i == 0 or n % (i + 2) == 0:
+                return False
+            i += 6
+        return True
+
+    start = time.perf_counter_ns()
+    if np is not None and not legacy:
+        # Sieve of Eratosthenes: each strike-off is a strided C store
+        sieve = np.ones(limit, dtype=bool)
+        sieve[:2] = False
+        for p in range(2, int(limit ** 0.5) + 1):
+            if sieve[p]:
+                sieve[p*p::p] = False
+        primes_count = int(sieve.sum())
+        prime_algo = "sieve"
+        prime_impl = "numpy"
+    elif _kernels is not None and not legacy:
+        primes_count = _kernels.count_primes(limit)
+        prime_algo = "trial_division"
+        prime_impl = "cython"
+    else:
+        primes_count = sum(1 for n in range(2, limit) if is_prime(n))
+        prime_algo = "trial_division"
+        prime_impl = "python"
+    duration_ns = time.perf_counter_ns() - start
+
+    return {
+        "prime_limit": limit,
+        "prime_finding_ms": duration_ns / 1e6,
+        "primes_found": primes_count,
+        "prime_algo": prime_algo,
+        "prime_impl": prime_impl,
+    }
+
+def run_memory_benchmark(size, legacy=False, progress=True):
+    """Sort `size` reverse-ordered integers"""
+    if np is not None and not legacy:
+        if progress:
+            print("Memory benchmark: creating array...")
+        arr = np.arange(size, 0, -1, dtype=np.int64)
+
+        if progress:
+            print("Memory benchmark: sorting...")
+        start = time.perf_counter_ns()
+        arr.sort(kind="quicksort")
+        duration_ns = time.perf_counter_ns() - start
+        sort_impl = "numpy"
+    else:
+        if progress:
+            print("Memory benchmark: creating list...")
+        lst = list(range(size, 0, -1))
+
+        if progress:
+            print("Memory benchmark: sorting...")
+        start = time.perf_counter_ns()
+        lst.sort()
+        duration_ns = time.perf_counter_ns() - start
+        sort_impl = "python"
+
+    return {
+        "sort_size": size,
+        "sort_benchmark_ms": duration_ns / 1e6,
+        "sort_impl": sort_impl,
+    }
+
 class CorePowerAnalyzer:
     """Analyze actual computational power of CPU cores"""
 
-    def __init__(self):
+    def __init__(self, legacy=False, honest=False, workload="default"):
         self.results = {}
         self.core_count = os.cpu_count()
+        self.legacy = legacy
+        self.honest = honest
+        self.workload = workload
+        self.concurrent = False
+        # During run_all_tests report text is buffered here and written out
+        # in a few large chunks instead of one locked stdout write per line;
+        # methods called on their own print straight to stdout
+        self._out = None
+
+    def _print(self, *args):
+        print(*args, file=self._out if self._out is not None else sys.stdout)
+
+    def _flush_output(self):
+        if self._out is not None:
+            sys.stdout.write(self._out.getvalue())
+            self._out = io.StringIO()
+        sys.stdout.flush()
+
+    @functools.cached_property
+    def _cpuinfo(self):
+        """Raw /proc/cpuinfo, read once and shared by the CPU collectors"""
+        return _read_cpuinfo_bytes()
+
+    @functools.cached_property
+    def _meminfo(self):
+        """Raw /proc/meminfo, read once"""
+        return _read_meminfo_bytes()
 
     def get_system_info(self):
         """Get system specifications"""
-        print("\n" + "="*70)
-        print("SYSTEM INFORMATION")
-        print("="*70)
-
-        # OS
-        if Path("/etc/os-release").exists():
-            with open("/etc/os-release") as f:
-                for line in f:
-                    if line.startswith("PRETTY_NAME"):
-                        os_name = line.split("=")[1].strip().strip('"')
-                        print(f"OS: {os_name}")
-                        break
-
-        # Kernel
-        kernel = subprocess.check_output(["uname", "-r"]).decode().strip()
-        print(f"Kernel: {kernel}")
-
-        # Architecture
-        arch = subprocess.check_output(["uname", "-m"]).decode().strip()
-        print(f"Architecture: {arch}")
-        self.results["arch"] = arch
+        self._report_system_info(self._collect_system_info())
 
     def get_cpu_specs(self):
-        """Get CPU specifications using lscpu"""
-        print("\n" + "="*70)
-        print("CPU SPECIFICATIONS")
-        print("="*70)
-
-        try:
-            output = subprocess.check_output(["lscpu"]).decode()
-            print(output)
-
-            # Parse key info
-            for line in output.split("\n"):
-                if "Model name" in line:
-                    cpu_model = line.split(":")[1].strip()
-                    self.results["cpu_model"] = cpu_model
-                    print(f"\n→ CPU Model: {cpu_model}")
-                elif "CPU(s)" in line and ":" in line:
-                    try:
-                        cpus = int(line.split(":")[1].strip())
-                        print(f"→ Total CPUs: {cpus}")
-                        self.results["cpu_count"] = cpus
-                    except:
-                        pass
-                elif "Thread(s) per core" in line:
-                    try:
-                        threads = int(line.split(":")[1].strip())
-                        print(f"→ Threads per core: {threads}")
-                    except:
-                        pass
-        except Exception as e:
-            print(f"Error running lscpu: {e}")
+        """Get CPU specifications from /proc/cpuinfo and sysfs"""
+        self._report_cpu_specs(self._collect_cpu_specs())
 
     def get_cpu_frequencies(self):
         """Get actual CPU frequencies from /proc/cpuinfo"""
-        print("\n" + "="*70)
-        print("CPU CLOCK SPEEDS")
-        print("="*70)
-
-        if Path("/proc/cpuinfo").exists():
-            with open("/proc/cpuinfo") as f:
-                content = f.read()
-
-            # Extract MHz values
-            mhz_values = []
-            for line in content.split("\n"):
-                if line.startswith("cpu MHz"):
-                    try:
-                        mhz = float(line.split(":")[1].strip())
-                        mhz_values.append(mhz)
-                    except:
-                        pass
-
-            if mhz_values:
-                print(f"\nClock speeds for each core:")
-                for i, mhz in enumerate(mhz_values[:8]):
-                    ghz = mhz / 1000
-                    print(f"  Core {i}: {mhz:.2f} MHz ({ghz:.2f} GHz)")
-
-                if len(mhz_values) > 8:
-                    print(f"  ... and {len(mhz_values) - 8} more cores")
-
-                avg_mhz = sum(mhz_values) / len(mhz_values)
-                avg_ghz = avg_mhz / 1000
-                print(f"\nAverage Clock Speed: {avg_mhz:.2f} MHz ({avg_ghz:.2f} GHz)")
-                self.results["avg_clock_mhz"] = avg_mhz
-                self.results["all_clock_speeds"] = mhz_values
-
-        # Get max frequency from sysfs
-        for policy in Path("/sys/devices/system/cpu/cpufreq").glob("policy*"):
-            max_freq_file = policy / "cpuinfo_max_freq"
-            if max_freq_file.exists():
-                with open(max_freq_file) as f:
-                    max_freq_khz = int(f.read().strip())
-                max_freq_mhz = max_freq_khz / 1000
-                print(f"\nMax Frequency (sysfs): {max_freq_mhz:.2f} MHz")
-                self.results["max_freq_mhz"] = max_freq_mhz
-                break
+        self._report_cpu_frequencies(self._collect_cpu_frequencies())
 
     def get_memory_info(self):
         """Get memory information"""
-        print("\n" + "="*70)
-        print("MEMORY INFORMATION")
-        print("="*70)
+        self._report_memory_info(self._collect_memory_info())
 
-        if Path("/proc/meminfo").exists():
-            with open("/proc/meminfo") as f:
-                for line in f:
-                    if line.startswith("MemTotal"):
-                        total_kb = int(line.split()[1])
-                        total_gb = total_kb / (1024 * 1024)
-                        print(f"Total Memory: {total_gb:.2f} GB")
-                        self.results["total_mem_gb"] = total_gb
-                    elif line.startswith("MemAvailable"):
-                        avail_kb = int(line.split()[1])
-                        avail_gb = avail_kb / (1024 * 1024)
-                        print(f"Available Memory: {avail_gb:.2f} GB")
-                        self.results["avail_mem_gb"] = avail_gb
+    def collect_facts(self):
+        """Gather system, CPU and memory facts (all I/O, no printing)"""
+        facts = {}
+        facts.update(self._collect_system_info())
+        facts.update(self._collect_cpu_specs())
+        facts.update(self._collect_cpu_frequencies())
+        facts.update(self._collect_memory_info())
+        return facts
 
-    def benchmark_single_core_arithmetic(self, iterations=100_000_000):
-        """Measure single-core arithmetic performance"""
-        print("\n" + "="*70)
-        print("SINGLE-CORE ARITHMETIC BENCHMARK")
-        print(f"({iterations:,} operations)")
-        print("="*70)
-
-        start = time.time()
-        total = 0
-        for i in range(iterations):
-            total += i
-        duration = time.time() - start
+    def _collect_system_info(self):
+        facts = {}
 
-        duration_ms = duration * 1000
-        ops_per_sec = iterations / duration
-        gops = ops_per_sec / 1_000_000_000
+        # OS
+        if Path("/etc/os-release").exists():
+            with open("/etc/os-release") as f:
+                for line in f:
+                    if line.startswith("PRETTY_NAME"):
+                        facts["os_name"] = line.split("=")[1].strip().strip('"')
+                        break
 
-        print(f"Time: {duration_ms:.2f} ms")
-        print(f"Throughput: {ops_per_sec:,.0f} ops/sec")
-        print(f"Gigaops: {gops:.3f} GOPS")
+        uname = os.uname()
+        facts["kernel"] = uname.release
+        facts["arch"] = uname.machine
+        return facts
+
+    def _collect_cpu_specs(self):
+        facts = {}
+        specs = {}
+
+        match = _MODEL_RE.search(self._cpuinfo)
+        if match:
+            specs["Model name"] = match.group(1).decode().strip()
+
+        cpus = os.cpu_count()
+        if cpus:
+            specs["CPU(s)"] = str(cpus)
+
+        siblings = Path("/sys/devices/system/cpu/cpu0/topology/thread_siblings_list")
+        if siblings.exists():
+            specs["Thread(s) per core"] = str(_count_cpu_list(siblings.read_text()))
+
+        # Only spawn lscpu when /proc and sysfs didn't cover everything
+        # (e.g. ARM cpuinfo has no "model name" line)
+        if len(specs) < 3 and shutil.which("lscpu"):
+            try:
+                output = subprocess.check_output(["lscpu"]).decode()
+                # Exact key matches, so that e.g. "NUMA node0 CPU(s)"
+                # is not mistaken for "CPU(s)"
+                for key, value in _LSCPU_RE.findall(output):
+                    specs.setdefault(key, value)
+            except Exception as e:
+                facts["lscpu_error"] = str(e)
+
+        if specs.get("Model name"):
+            facts["cpu_model"] = specs["Model name"]
+        try:
+            facts["cpu_count"] = int(specs["CPU(s)"])
+        except (KeyError, ValueError):
+            pass
+        try:
+            facts["threads_per_core"] = int(specs["Thread(s) per core"])
+        except (KeyError, ValueError):
+            pass
+        return facts
+
+    def _collect_cpu_frequencies(self):
+        facts = {}
+
+        # Single streaming pass: keep the first 8 readings for display
+        # plus running aggregates, rather than every core's value
+        count = 0
+        total_mhz = 0.0
+        min_mhz = max_mhz = None
+        head = []
+        for match in _MHZ_RE.finditer(self._cpuinfo):
+            mhz = float(match.group(1))
+            if len(head) < 8:
+                head.append(mhz)
+            count += 1
+            total_mhz += mhz
+            if min_mhz is None or mhz < min_mhz:
+                min_mhz = mhz
+            if max_mhz is None or mhz > max_mhz:
+                max_mhz = mhz
+
+        if count:
+            facts["avg_clock_mhz"] = total_mhz / count
+            facts["min_clock_mhz"] = min_mhz
+            facts["max_clock_mhz"] = max_mhz
+            facts["clock_count"] = count
+            facts["clock_speeds_head"] = head
+
+        # Get max frequency from sysfs, stopping at the first policy that has it
+        try:
+            with os.scandir("/sys/devices/system/cpu/cpufreq") as it:
+                for entry in it:
+                    if not entry.name.startswith("policy"):
+                        continue
+                    try:
+                        with open(os.path.join(entry.path, "cpuinfo_max_freq")) as f:
+                            facts["max_freq_mhz"] = int(f.read()) / 1000
+                        break
+                    except OSError:
+                        continue
+        except OSError:
+            # Missing, unreadable or not a directory: no sysfs max frequency
+            pass
+
+        return facts
+
+    def _collect_memory_info(self):
+        facts = {}
+
+        total_kb = _mem_kb(self._meminfo, b"MemTotal:")
+        if total_kb is not None:
+            facts["total_mem_gb"] = total_kb / (1024 * 1024)
+
+        avail_kb = _mem_kb(self._meminfo, b"MemAvailable:")
+        if avail_kb is not None:
+            facts["avail_mem_gb"] = avail_kb / (1024 * 1024)
+
+        return facts
+
+    def report_facts(self, facts):
+        """Print collected facts and store the ones that feed the report"""
+        self._report_system_info(facts)
+        self._report_cpu_specs(facts)
+        self._report_cpu_frequencies(facts)
+        self._report_memory_info(facts)
+
+    def _report_system_info(self, facts):
+        self._print("\n" + "="*70)
+        self._print("SYSTEM INFORMATION")
+        self._print("="*70)
+
+        if "os_name" in facts:
+            self._print(f"OS: {facts['os_name']}")
+        self._print(f"Kernel: {facts['kernel']}")
+        self._print(f"Architecture: {facts['arch']}")
+        self.results["arch"] = facts["arch"]
+
+    def _report_cpu_specs(self, facts):
+        self._print("\n" + "="*70)
+        self._print("CPU SPECIFICATIONS")
+        self._print("="*70)
+
+        if "lscpu_error" in facts:
+            self._print(f"Error running lscpu: {facts['lscpu_error']}")
+        if "cpu_model" in facts:
+            self.results["cpu_model"] = facts["cpu_model"]
+            self._print(f"→ CPU Model: {facts['cpu_model']}")
+        if "cpu_count" in facts:
+            self._print(f"→ Total CPUs: {facts['cpu_count']}")
+            self.results["cpu_count"] = facts["cpu_count"]
+        if "threads_per_core" in facts:
+            self._print(f"→ Threads per core: {facts['threads_per_core']}")
+            self.results["threads_per_core"] = facts["threads_per_core"]
+
+    def _report_cpu_frequencies(self, facts):
+        self._print("\n" + "="*70)
+        self._print("CPU CLOCK SPEEDS")
+        self._print("="*70)
+
+        if "clock_count" in facts:
+            count = facts["clock_count"]
+            self._print(f"\nClock speeds for each core:")
+            for i, mhz in enumerate(facts["clock_speeds_head"]):
+                ghz = mhz / 1000
+                self._print(f"  Core {i}: {mhz:.2f} MHz ({ghz:.2f} GHz)")
+
+            if count > 8:
+                self._print(f"  ... and {count - 8} more cores")
+
+            avg_mhz = facts["avg_clock_mhz"]
+            avg_ghz = avg_mhz / 1000
+            self._print(f"\nAverage Clock Speed: {avg_mhz:.2f} MHz ({avg_ghz:.2f} GHz)")
+            self._print(f"Range: {facts['min_clock_mhz']:.2f} - {facts['max_clock_mhz']:.2f} MHz")
+            for key in ("avg_clock_mhz", "min_clock_mhz", "max_clock_mhz",
+                        "clock_count", "clock_speeds_head"):
+                self.results[key] = facts[key]
+
+        if "max_freq_mhz" in facts:
+            self._print(f"\nMax Frequency (sysfs): {facts['max_freq_mhz']:.2f} MHz")
+            self.results["max_freq_mhz"] = facts["max_freq_mhz"]
+
+    def _report_memory_info(self, facts):
+        self._print("\n" + "="*70)
+        self._print("MEMORY INFORMATION")
+        self._print("="*70)
+
+        if "total_mem_gb" in facts:
+            self._print(f"Total Memory: {facts['total_mem_gb']:.2f} GB")
+            self.results["total_mem_gb"] = facts["total_mem_gb"]
+        if "avail_mem_gb" in facts:
+            self._print(f"Available Memory: {facts['avail_mem_gb']:.2f} GB")
+            self.results["avail_mem_gb"] = facts["avail_mem_gb"]
 
-        self.results["arithmetic_benchmark_ms"] = duration_ms
-        self.results["arithmetic_gops"] = gops
+    def benchmark_single_core_arithmetic(self, iterations=100_000_000):
+        """Measure single-core arithmetic performance"""
+        return self.report_arithmetic(run_arithmetic_benchmark(iterations, self.legacy))
+
+    def report_arithmetic(self, metrics):
+        """Print and store arithmetic benchmark results"""
+        iterations = metrics["arithmetic_iterations"]
+        self._print("\n" + "="*70)
+        self._print("SINGLE-CORE ARITHMETIC BENCHMARK")
+        self._print(f"({iterations:,} operations)")
+        if metrics["arithmetic_impl"] == "numpy":
+            self._print("(Vectorized NumPy arithmetic)")
+        elif metrics["arithmetic_impl"] == "cython":
+            self._print("(Cython typed loop)")
+        elif metrics["arithmetic_impl"] == "builtin_sum":
+            self._print("(Built-in sum over range)")
+        self._print("="*70)
+
+        duration_ms = metrics["arithmetic_benchmark_ms"]
+        gops = metrics["arithmetic_gops"]
+        ops_per_sec = gops * 1_000_000_000
+
+        self._print(f"Time: {duration_ms:.2f} ms")
+        self._print(f"Throughput: {ops_per_sec:,.0f} ops/sec")
+        self._print(f"Gigaops: {gops:.3f} GOPS")
+
+        self.results.update(metrics)
 
         return duration_ms
 
     def benchmark_fibonacci_single_thread(self, n=35):
         """Measure recursive computation (single-threaded)"""
-        print("\n" + "="*70)
-        print(f"FIBONACCI BENCHMARK (n={n})")
-        print("(Recursive, CPU-bound)")
-        print("="*70)
-
-        def fib(n):
-            if n <= 1:
-                return n
-            return fib(n-1) + fib(n-2)
-
-        start = time.time()
-        result = fib(n)
-        duration = time.time() - start
-
-        duration_ms = duration * 1000
-        print(f"Fib({n}) = {result}")
-        print(f"Time: {duration_ms:.2f} ms")
-
-        self.results["fibonacci_ms"] = duration_ms
+        self.report_fibonacci(run_fibonacci_benchmark(n, self.honest, self.legacy))
+
+    def report_fibonacci(self, metrics):
+        """Print and store fibonacci benchmark results"""
+        n = metrics["fibonacci_n"]
+        self._print("\n" + "="*70)
+        self._print(f"FIBONACCI BENCHMARK (n={n})")
+        self._print("(Recursive, CPU-bound)")
+        if metrics["fibonacci_impl"] == "numba":
+            self._print("(Numba JIT-compiled)")
+        elif metrics["fibonacci_impl"] == "cython":
+            self._print("(Cython-compiled)")
+        self._print("="*70)
+
+        self._print(f"Fib({n}) = {metrics['fibonacci_result']}")
+        self._print(f"Time: {metrics['fibonacci_ms']:.2f} ms")
+        self._print(f"Time (memoized): {metrics['fibonacci_memo_ms']:.3f} ms")
+        if "fibonacci_iter_ms" in metrics:
+            self._print(f"Time (iterative, {metrics['fibonacci_iter_repeats']:,} runs): "
+                        f"{metrics['fibonacci_iter_ms']:.2f} ms")
+
+        self.results.update(metrics)
 
     def benchmark_prime_finding(self, limit=100_000):
         """Find primes - mathematical computation"""
-        print("\n" + "="*70)
-        print(f"PRIME NUMBER BENCHMARK")
-        print(f"(Finding primes up to {limit:,})")
-        print("="*70)
+        self.report_primes(run_prime_benchmark(limit, self.legacy))
 
-        def is_prime(n):
-            if n < 2:
-                return False
-            if n == 2:
-                return True
-            if n % 2 == 0:
-                return False
-            for i in range(3, int(math.sqrt(n)) + 1, 2):
-                if n % i == 0:
-                    return False
-            return True
-
-        start = time.time()
-        primes = [n for n in range(2, limit) if is_prime(n)]
-        duration = time.time() - start
+    def report_primes(self, metrics):
+        """Print and store prime benchmark results"""
+        limit = metrics["prime_limit"]
+        self._print("\n" + "="*70)
+        self._print(f"PRIME NUMBER BENCHMARK")
+        self._print(f"(Finding primes up to {limit:,})")
+        self._print("="*70)
 
-        duration_ms = duration * 1000
-        numbers_per_sec = limit / duration
+        duration_ms = metrics["prime_finding_ms"]
+        numbers_per_sec = limit / (duration_ms / 1000)
 
-        print(f"Primes found: {len(primes)}")
-        print(f"Time: {duration_ms:.2f} ms")
-        print(f"Numbers checked per sec: {numbers_per_sec:,.0f}")
+        self._print(f"Primes found: {metrics['primes_found']}")
+        self._print(f"Time: {duration_ms:.2f} ms")
+        self._print(f"Numbers checked per sec: {numbers_per_sec:,.0f}")
 
-        self.results["prime_finding_ms"] = duration_ms
-        self.results["primes_found"] = len(primes)
+        self.results.update(metrics)
 
     def benchmark_memory_intensive(self, size=10_000_000):
         """Sort large list - memory + CPU"""
-        print("\n" + "="*70)
-        print(f"MEMORY-INTENSIVE BENCHMARK")
-        print(f"(Sorting {size:,} elements)")
-        print("="*70)
-
-        print("Creating list...")
-        lst = list(range(size, 0, -1))
-
-        print("Sorting...")
-        start = time.time()
-        lst.sort()
-        duration = time.time() - start
-
-        duration_ms = duration * 1000
-        elements_per_sec = size / duration
+        self.report_memory(run_memory_benchmark(size, self.legacy))
+
+    def report_memory(self, metrics):
+        """Print and store memory benchmark results"""
+        size = metrics["sort_size"]
+        self._print("\n" + "="*70)
+        self._print(f"MEMORY-INTENSIVE BENCHMARK")
+        self._print(f"(Sorting {size:,} elements)")
+        self._print("="*70)
+
+        duration_ms = metrics["sort_benchmark_ms"]
+        elements_per_sec = size / (duration_ms / 1000)
+
+        self._print(f"Time: {duration_ms:.2f} ms")
+        self._print(f"Elements sorted per sec: {elements_per_sec:,.0f}")
+
+        self.results.update(metrics)
+
+    def run_benchmarks(self, iterations=100_000_000, n=35, limit=100_000, size=5_000_000):
+        """Run the four independent benchmarks, one per physical core when available"""
+        jobs = [
+            (self.report_arithmetic, run_arithmetic_benchmark, (iterations, self.legacy)),
+            (self.report_fibonacci, run_fibonacci_benchmark, (n, self.honest, self.legacy)),
+            (self.report_primes, run_prime_benchmark, (limit, self.legacy)),
+            (self.report_memory, run_memory_benchmark, (size, self.legacy)),
+        ]
+
+        # Count physical cores, not SMT siblings: two benchmarks on one core
+        # would share its execution units and skew each other's timings
+        threads = self.results.get("threads_per_core")
+        if threads is None:
+            threads = self._collect_cpu_specs().get("threads_per_core", 1)
+        physical_cores = max(1, (self.core_count or 1) // max(threads, 1))
+
+        workers = min(len(jobs), physical_cores)
+        self.concurrent = workers > 1
+        self.results["benchmark_workers"] = workers
+
+        # Emit the buffered report so far; forked workers would otherwise
+        # inherit unflushed stdout and echo it twice. Result sections are
+        # buffered again and follow once every benchmark has finished, so
+        # progress lines printed meanwhile name their benchmark.
+        self._flush_output()
+
+        if self.concurrent:
+            print(f"Running {len(jobs)} benchmarks on {workers} worker processes...")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(func, *args) for _, func, args in jobs]
+                metrics = [future.result() for future in futures]
+            for (report, _, _), result in zip(jobs, metrics):
+                report(result)
+        else:
+            print(f"Running {len(jobs)} benchmarks sequentially...")
+            for report, func, args in jobs:
+                report(func(*args))
+
+    def _fit_size(self, key, measure, target_ms):
+        """Grow a probe 10x at a time until it takes a measurable time, then
+        extrapolate to target_ms using the growth exponent seen between the
+        last two probes (1 for linear work, higher for e.g. trial division)"""
+        ceiling = self._workload_ceiling(key)
+        size, ms = MIN_WORKLOAD[key], measure(MIN_WORKLOAD[key])
+        previous = None
+        while ms < target_ms * CALIBRATION_PROBE_FRACTION and size < ceiling:
+            previous = (size, ms)
+            size = min(size * 10, ceiling)
+            ms = measure(size)
+
+        exponent = 1.0
+        if previous is not None and size > previous[0] and ms > previous[1] > 0:
+            exponent = math.log(ms / previous[1]) / math.log(size / previous[0])
+            exponent = min(max(exponent, 1.0), 2.0)
+
+        fitted = int(size * (target_ms / max(ms, 1e-6)) ** (1 / exponent))
+        return min(max(fitted, MIN_WORKLOAD[key]), ceiling)
+
+    def _fit_fib_n(self, measure, target_ms):
+        """Like _fit_size, but recursive fib work grows by PHI per +1 on n"""
+        ceiling = self._workload_ceiling("n")
+        n, ms = MIN_WORKLOAD["n"], measure(MIN_WORKLOAD["n"])
+        while ms < target_ms * CALIBRATION_PROBE_FRACTION and n < ceiling:
+            n = min(n + 5, ceiling)
+            ms = measure(n)
+
+        fitted = n + round(math.log(target_ms / max(ms, 1e-6), PHI))
+        return min(max(fitted, MIN_WORKLOAD["n"]), ceiling)
+
+    def _workload_ceiling(self, key):
+        """Largest size calibration may pick: --quick never exceeds a default
+        run, so fast kernels (NumPy, Numba) aren't grown up to the target"""
+        if self.workload == "quick":
+            return DEFAULT_WORKLOAD[key]
+        return MAX_WORKLOAD[key]
+
+    def scale_workload(self):
+        """Pick benchmark sizes for the selected workload mode"""
+        if self.workload == "default":
+            return dict(DEFAULT_WORKLOAD)
+
+        target_ms = CALIBRATION_TARGET_S * 1000
+        if self.workload == "long":
+            target_ms *= 10
+
+        # Each benchmark is probed with the same implementation it will run
+        # (NumPy, Numba, Cython or pure Python), since their costs differ
+        # by orders of magnitude
+        start = time.perf_counter_ns()
+        workload = {
+            "iterations": self._fit_size(
+                "iterations",
+                lambda size: run_arithmetic_benchmark(size, self.legacy)["arithmetic_benchmark_ms"],
+                target_ms),
+            "n": self._fit_fib_n(
+                lambda n: run_fibonacci_benchmark(n, legacy=self.legacy)["fibonacci_ms"],
+                target_ms),
+            "limit": self._fit_size(
+                "limit",
+                lambda size: run_prime_benchmark(size, self.legacy)["prime_finding_ms"],
+                target_ms),
+            "size": self._fit_size(
+                "size",
+                lambda size: run_memory_benchmark(size, self.legacy, progress=False)["sort_benchmark_ms"],
+                target_ms),
+        }
+        calibration_ms = (time.perf_counter_ns() - start) / 1e6
 
-        print(f"Time: {duration_ms:.2f} ms")
-        print(f"Elements sorted per sec: {elements_per_sec:,.0f}")
+        self._print(f"Calibration: {calibration_ms:.2f} ms, targeting ~{target_ms:.0f} ms "
+                    f"per benchmark ({self.workload} workload)")
+        self.results["calibration_ms"] = calibration_ms
 
-        self.results["sort_benchmark_ms"] = duration_ms
+        return workload
 
     def calculate_core_power(self):
         """Calculate computational power per core"""
-        print("\n" + "="*70)
-        print("CORE POWER CALCULATION")
-        print("="*70)
+        self._print("\n" + "="*70)
+        self._print("CORE POWER CALCULATION")
+        self._print("="*70)
 
         if "cpu_count" not in self.results or "avg_clock_mhz" not in self.results:
-            print("⚠️  Insufficient data for calculation")
+            self._print("⚠️  Insufficient data for calculation")
             return
 
         cores = self.results["cpu_count"]
         clock_mhz = self.results["avg_clock_mhz"]
         clock_ghz = clock_mhz / 1000
 
-        print(f"\nFormula: Cores × Clock Speed × IPC (Instructions Per Cycle)")
-        print(f"Cores: {cores}")
-        print(f"Clock Speed: {clock_ghz:.2f} GHz")
+        self._print(f"\nFormula: Cores × Clock Speed × IPC (Instructions Per Cycle)")
+        self._print(f"Cores: {cores}")
+        self._print(f"Clock Speed: {clock_ghz:.2f} GHz")
 
         # Different IPC assumptions
-        print(f"\nTheoretical Peak Performance:")
+        self._print(f"\nTheoretical Peak Performance:")
         for ipc in [1, 2, 3, 4]:
             gflops = (cores * clock_mhz * ipc) / 1000
-            print(f"  IPC={ipc}: {gflops:.1f} GFLOPS")
+            self._print(f"  IPC={ipc}: {gflops:.1f} GFLOPS")
 
         # Calculate per-core power
         per_core_ghz = clock_ghz
-        print(f"\nPer-Core Performance:")
-        print(f"  Per core @ {clock_ghz:.2f} GHz: ~{clock_ghz:.1f} GFLOPS (IPC=1)")
-        print(f"  Per core @ {clock_ghz:.2f} GHz: ~{clock_ghz*2:.1f} GFLOPS (IPC=2)")
+        self._print(f"\nPer-Core Performance:")
+        self._print(f"  Per core @ {clock_ghz:.2f} GHz: ~{clock_ghz:.1f} GFLOPS (IPC=1)")
+        self._print(f"  Per core @ {clock_ghz:.2f} GHz: ~{clock_ghz*2:.1f} GFLOPS (IPC=2)")
 
         self.results["theoretical_peak_gflops_ipc1"] = (cores * clock_mhz) / 1000
         self.results["theoretical_peak_gflops_ipc2"] = (cores * clock_mhz * 2) / 1000
@@ -289,84 +826,121 @@ class CorePowerAnalyzer:
 
     def generate_performance_rating(self):
         """Generate performance rating"""
-        print("\n" + "="*70)
-        print("PERFORMANCE RATING")
-        print("="*70)
+        self._print("\n" + "="*70)
+        self._print("PERFORMANCE RATING")
+        self._print("="*70)
 
+        # Concurrent benchmarks are capped at one per physical core, so this
+        # timing is not shared with an SMT sibling and the thresholds below
+        # apply unchanged
         arithmetic_ms = self.results.get("arithmetic_benchmark_ms")
 
         if arithmetic_ms:
-            print(f"\nArithmetic Performance: {arithmetic_ms:.2f} ms (100M ops)")
-
-            if arithmetic_ms < 80:
-                rating = "🟢 EXCELLENT"
-                reason = "Well-provisioned, no throttling"
-            elif arithmetic_ms < 150:
-                rating = "🟢 GOOD"
-                reason = "Normal performance"
-            elif arithmetic_ms < 250:
-                rating = "🟡 ACCEPTABLE"
-                reason = "Some system load or throttling"
-            elif arithmetic_ms < 400:
-                rating = "🟠 DEGRADED"
-                reason = "Possible thermal throttling"
+            # Thresholds are for 100M ops; normalize calibrated runs to match
+            iterations = self.results.get("arithmetic_iterations", 100_000_000)
+            arithmetic_ms *= 100_000_000 / iterations
+            impl = self.results.get("arithmetic_impl", "python_loop")
+            self._print(f"\nArithmetic Performance: {arithmetic_ms:.2f} ms (per 100M ops, {impl})")
+
+            thresholds = ARITHMETIC_THRESHOLDS.get(impl)
+            if thresholds is not None:
+                rating, reason = _rate(arithmetic_ms, thresholds)
+                self._print(f"Rating: {rating}")
+                self._print(f"Reason: {reason}")
+            else:
+                self._print(f"Rating: n/a (no thresholds for the {impl} implementation)")
+
+        ns_per_step = self.results.get("fibonacci_iter_ns_per_step")
+        if ns_per_step is not None:
+            # The recursive fib mostly measures interpreter frame cost; the
+            # iterative one is the steadier proxy for the host itself
+            self._print(f"\nInteger arithmetic (iterative fib): {ns_per_step:.1f} ns per step")
+            fib_impl = self.results.get("fibonacci_impl", "python")
+            if fib_impl == "python":
+                self._print(f"Function-call overhead (recursive fib): {self.results['fibonacci_ms']:.2f} ms")
             else:
-                rating = "🔴 POOR"
-                reason = "Significant throttling or overload"
+                # Compiled fib has no interpreter frames to measure
+                self._print(f"Recursive fib ({fib_impl}-compiled): {self.results['fibonacci_ms']:.2f} ms")
 
-            print(f"Rating: {rating}")
-            print(f"Reason: {reason}")
+            rating, reason = _rate(ns_per_step, FIB_ITER_THRESHOLDS)
+            self._print(f"Rating: {rating}")
+            self._print(f"Reason: {reason}")
 
         cores = self.results.get("cpu_count")
         if cores:
-            print(f"\nGitHub Actions Comparison:")
+            self._print(f"\nGitHub Actions Comparison:")
             if cores >= 4:
-                print(f"  ✓ Public Repo tier (4+ cores)")
+                self._print(f"  ✓ Public Repo tier (4+ cores)")
             elif cores >= 2:
-                print(f"  ✓ Private Repo tier (2+ cores)")
+                self._print(f"  ✓ Private Repo tier (2+ cores)")
             else:
-                print(f"  ⚠️  Limited tier ({cores} core{'s' if cores > 1 else ''})")
+                self._print(f"  ⚠️  Limited tier ({cores} core{'s' if cores > 1 else ''})")
 
     def export_json(self):
         """Export results as JSON"""
-        print("\n" + "="*70)
-        print("JSON REPORT")
-        print("="*70)
+        self._print("\n" + "="*70)
+        self._print("JSON REPORT")
+        self._print("="*70)
 
         report = {
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "environment": "GitHub Actions",
+            "concurrency": self.concurrent,
             "metrics": self.results
         }
 
-        print(json.dumps(report, indent=2))
+        # Stream straight to stdout rather than building the string twice
+        self._flush_output()
+        # orjson emits bytes, so it needs a binary stdout; redirected text
+        # streams (StringIO, notebooks, capture) take the json path
+        stdout_bytes = getattr(sys.stdout, "buffer", None)
+        if orjson is not None and stdout_bytes is not None:
+            stdout_bytes.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
 
         return report
 
     def run_all_tests(self):
         """Run complete analysis"""
-        print("\n" + "🔍 GitHub Actions CPU Core Power Analyzer")
-        print("="*70)
+        self._out = io.StringIO()
+        try:
+            self._print("\n" + "🔍 GitHub Actions CPU Core Power Analyzer")
+            self._print("="*70)
 
-        self.get_system_info()
-        self.get_cpu_specs()
-        self.get_cpu_frequencies()
-        self.get_memory_info()
+            self.report_facts(self.collect_facts())
 
-        print("\n" + "⚡ Running Performance Benchmarks")
-        print("="*70)
+            self._print("\n" + "⚡ Running Performance Benchmarks")
+            self._print("="*70)
 
-        arithmetic_time = self.benchmark_single_core_arithmetic(iterations=100_000_000)
-        self.benchmark_fibonacci_single_thread(n=35)
-        self.benchmark_prime_finding(limit=100000)
-        self.benchmark_memory_intensive(size=5_000_000)
+            self.results["workload"] = self.workload
+            self.run_benchmarks(**self.scale_workload())
 
-        self.calculate_core_power()
-        self.generate_performance_rating()
-        self.export_json()
+            self.calculate_core_power()
+            self.generate_performance_rating()
+            self.export_json()
 
-        print("\n" + "✅ Analysis complete!")
+            self._print("\n" + "✅ Analysis complete!")
+        finally:
+            self._flush_output()
+            self._out = None
 
 if __name__ == "__main__":
-    analyzer = CorePowerAnalyzer()
+    parser = argparse.ArgumentParser(description="GitHub Actions CPU Core Power Analyzer")
+    parser.add_argument("--legacy", action="store_true",
+                        help="use the original pure-Python loops and list sort")
+    parser.add_argument("--honest", action="store_true",
+                        help="also time an iterative fibonacci, separating call overhead from arithmetic")
+    size_group = parser.add_mutually_exclusive_group()
+    size_group.add_argument("--quick", dest="workload", action="store_const", const="quick",
+                            help="calibrate each benchmark's size to ~200ms on this host, "
+                                 "never above the default sizes")
+    size_group.add_argument("--long", dest="workload", action="store_const", const="long",
+                            help="calibrate each benchmark's size to ~2s, for steadier numbers "
+                                 "(sieve and sort sizes are capped to bound memory)")
+    parser.set_defaults(workload="default")
+    args = parser.parse_args()
+
+    analyzer = CorePowerAnalyzer(legacy=args.legacy, honest=args.honest, workload=args.workload)
     analyzer.run_all_tests()
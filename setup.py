@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Builds the optional Cython benchmark kernels (_kernels.pyx).
+
+    pip install cython
+    python3 setup.py build_ext --inplace
+
+The analyzer runs without them; when _kernels is importable it replaces
+the pure-Python fallbacks.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="core-power-analyzer-kernels",
+    ext_modules=cythonize(["_kernels.pyx"], compiler_directives={"language_level": 3}),
+)